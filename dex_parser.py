@@ -1,9 +1,24 @@
 #!/usr/bin/python3
 
 import enum
+import mmap
+import re
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+# hashlib's sha1 is backed by OpenSSL when available, which already
+# dispatches to the CPU SHA extensions (SHA-NI / ARMv8 SHA1)
 from hashlib import sha1
-from dataclasses import dataclass
-from zlib import adler32
+from functools import lru_cache
+from itertools import accumulate, islice
+from multiprocessing.shared_memory import SharedMemory
+try:
+    # ISA-L ships a SIMD adler32, several times faster than stock zlib's
+    from isal.isal_zlib import adler32
+except ImportError:
+    from zlib import adler32
 
 
 class BadDexFileError(Exception):
@@ -16,6 +31,24 @@ ENDIAN_CONSTANT = 0x12345678
 REVERSE_ENDIAN_CONSTANT = 0x78563412
 NO_INDEX = 0xffffffff
 
+# magic, version, pad, checksum, signature, file_size, header_size,
+# endian_tag, then the link/map/ids/class_defs/data sizes and offsets
+_HEADER_ITEM = struct.Struct("<4s3sBI20s20I")
+_UINT = struct.Struct("<I")
+_MAP_ITEM = struct.Struct("<HHII")
+_STRING_ID_ITEM = struct.Struct("<I")
+_TYPE_ID_ITEM = struct.Struct("<I")
+_TYPE_ITEM = struct.Struct("<H")
+_PROTO_ID_ITEM = struct.Struct("<III")
+_FIELD_ID_ITEM = struct.Struct("<HHI")
+_METHOD_ID_ITEM = struct.Struct("<HHI")
+_ANNOTATION_OFF_ITEM = struct.Struct("<I")
+_FIELD_ANNOTATION = struct.Struct("<II")
+_METHOD_ANNOTATION = struct.Struct("<II")
+_PARAMETER_ANNOTATION = struct.Struct("<II")
+_ANNOTATIONS_DIRECTORY_ITEM = struct.Struct("<IIII")
+_CLASS_DEF_ITEM = struct.Struct("<IIIIIIII")
+
 
 class AccessFlag(enum.Flag):
     """Indicates accessibility and properties of classes and class members"""
@@ -91,6 +124,41 @@ class ValueFormat(enum.Enum):
     VALUE_BOOLEAN = 0x1f       # boolean (0…1)   (none)
 
 
+# Enum lookups by value go through EnumType.__call__, which is noticeably
+# slower than a plain dict lookup for values decoded in bulk
+_TYPE_CODES = {code.value: code for code in TypeCode}
+_VALUE_FORMATS = {value_format.value: value_format for value_format in ValueFormat}
+
+
+def _type_code(value: int) -> TypeCode:
+    """Return the TypeCode corresponding to value"""
+    try:
+        return _TYPE_CODES[value]
+    except KeyError:
+        raise BadDexFileError(f"Unknown type code ({value:#x})") from None
+
+
+def _value_format(value: int) -> ValueFormat:
+    """Return the ValueFormat corresponding to value"""
+    try:
+        return _VALUE_FORMATS[value]
+    except KeyError:
+        raise BadDexFileError(f"Unknown value format ({value:#x})") from None
+
+
+# Rendering a Flag walks all of its members, and the same few combinations
+# show up on nearly every field and method
+@lru_cache(maxsize=None)
+def _flag_str(value: int) -> str:
+    """Return the string representation of the AccessFlag value"""
+    return str(AccessFlag(value))
+
+
+def _sha1_digest(data: bytes | memoryview) -> bytes:
+    """Return the SHA1 digest of data"""
+    return sha1(data, usedforsecurity=False).digest()
+
+
 class HeaderItem:
     """Data present in header section"""
     __slots__ = ("version", "checksum", "signature", "file_size",
@@ -102,35 +170,59 @@ class HeaderItem:
                  "class_defs_off", "data_size", "data_off")
 
     HEADER_SIZE = 112
+    # Below this size, starting a thread costs more than hashing serially
+    PARALLEL_VERIFY_SIZE = 1 << 20
+
+    def __init__(self, data: bytes | memoryview, verify: bool = True):
+        if len(data) < self.HEADER_SIZE:
+            raise BadDexFileError(f"File is too small to contain a header ({len(data)} bytes)")
+        (magic, version, pad, expected_checksum, signature, file_size,
+         header_size, endian_tag,
+         self.link_size, self.link_off, self.map_off,
+         self.string_ids_size, self.string_ids_off,
+         self.type_ids_size, self.type_ids_off,
+         self.proto_ids_size, self.proto_ids_off,
+         self.field_ids_size, self.field_ids_off,
+         self.method_ids_size, self.method_ids_off,
+         self.class_defs_size, self.class_defs_off,
+         self.data_size, self.data_off) = _HEADER_ITEM.unpack_from(data, 0)
 
-    def __init__(self, data: bytes):
-        magic = data[0 : 4]
         if magic != MAGIC:
             raise BadDexFileError(f"Bad magic: should start with {MAGIC.hex()}")
-        self.version = data[4:7].decode("utf8")
-        if data[7] != 0x00:
+        self.version = version.decode("utf8")
+        if pad != 0x00:
             raise BadDexFileError(f"Bad magic: 7th byte should be 00")
 
-        self.checksum = adler32(data[12:])
-        expected_checksum = int.from_bytes(data[8 : 12], "little")
-        if self.checksum != expected_checksum:
-            raise BadDexFileError(f"Checksum should be {expected_checksum:x}, not {self.checksum:x}")
-
-        signature = data[12 : 32]
-        self.signature = sha1(data[32:]).digest()
-        if self.signature != signature:
-            raise BadDexFileError(f"SHA1 signature should be {signature.hex()}, not {self.signature.hex()}")
+        if verify:
+            # Hash through a memoryview so the payload is not copied first
+            view = memoryview(data)
+            if len(view) >= self.PARALLEL_VERIFY_SIZE:
+                # Both hashes release the GIL, compute them concurrently
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    signature_future = executor.submit(_sha1_digest, view[32:])
+                    self.checksum = adler32(view[12:])
+                    self.signature = signature_future.result()
+            else:
+                self.checksum = adler32(view[12:])
+                self.signature = _sha1_digest(view[32:])
+
+            if self.checksum != expected_checksum:
+                raise BadDexFileError(f"Checksum should be {expected_checksum:x}, not {self.checksum:x}")
+
+            if self.signature != signature:
+                raise BadDexFileError(f"SHA1 signature should be {signature.hex()}, not {self.signature.hex()}")
+        else:
+            # Both require reading the whole file, trust the header instead
+            self.checksum = expected_checksum
+            self.signature = signature
 
         self.file_size = len(data)
-        file_size = int.from_bytes(data[32 : 36], "little")
         if self.file_size != file_size:
             raise BadDexFileError(f"File size should be {file_size}, not {self.file_size}")
 
-        header_size = int.from_bytes(data[36 : 40], "little")
         if header_size != self.HEADER_SIZE:
             raise BadDexFileError(f"File size should be {self.HEADER_SIZE}, not {header_size}")
 
-        endian_tag = int.from_bytes(data[40 : 44], "little")
         if endian_tag == ENDIAN_CONSTANT:
             self.endianness = "big"
         elif endian_tag == REVERSE_ENDIAN_CONSTANT:
@@ -138,460 +230,654 @@ class HeaderItem:
         else:
             raise BadDexFileError(f"Bad endian constant ({endian_tag:#x})")
 
-        self.link_size = int.from_bytes(data[44 : 48], "little")
-        self.link_off = int.from_bytes(data[48 : 52], "little")
-        self.map_off = int.from_bytes(data[52 : 56], "little")
-        self.string_ids_size = int.from_bytes(data[56 : 60], "little")
-        self.string_ids_off = int.from_bytes(data[60 : 64], "little")
-        self.type_ids_size = int.from_bytes(data[64 : 68], "little")
-        self.type_ids_off = int.from_bytes(data[68 : 72], "little")
-        self.proto_ids_size = int.from_bytes(data[72 : 76], "little")
-        self.proto_ids_off = int.from_bytes(data[76 : 80], "little")
-        self.field_ids_size = int.from_bytes(data[80 : 84], "little")
-        self.field_ids_off = int.from_bytes(data[84 : 88], "little")
-        self.method_ids_size = int.from_bytes(data[88 : 92], "little")
-        self.method_ids_off = int.from_bytes(data[92 : 96], "little")
-        self.class_defs_size = int.from_bytes(data[96 : 100], "little")
-        self.class_defs_off = int.from_bytes(data[100 : 104], "little")
-        self.data_size = int.from_bytes(data[104 : 108], "little")
-        self.data_off = int.from_bytes(data[108 : 112], "little")
-
     def dump_data(self) -> str:
         """Return a string representing the header"""
-        data = "Header:\n"
-        data += f"\tMagic: {MAGIC.hex()}\n"
-        data += f"\tVersion: {self.version}\n"
-        data += f"\tChecksum: {self.checksum:x}\n"
-        data += f"\tSignature: {self.signature.hex()}\n"
-        data += f"\tFile size: {self.file_size}\n"
-        data += f"\tHeader size: {self.HEADER_SIZE}\n"
-        data += f"\tEndianness: {self.endianness}\n"
-        data += f"\tLink size: {self.link_size}\n"
-        data += f"\tLink off: {self.link_off:#x}\n"
-        data += f"\tMap off: {self.map_off:#x}\n"
-        data += f"\tString ids size: {self.string_ids_size}\n"
-        data += f"\tString ids off: {self.string_ids_off:#x}\n"
-        data += f"\tType ids size: {self.type_ids_size}\n"
-        data += f"\tType ids off: {self.type_ids_off:#x}\n"
-        data += f"\tProto ids size: {self.proto_ids_size}\n"
-        data += f"\tProto ids off: {self.proto_ids_off:#x}\n"
-        data += f"\tField ids size: {self.field_ids_size}\n"
-        data += f"\tField ids off: {self.field_ids_off:#x}\n"
-        data += f"\tMethod ids size: {self.method_ids_size}\n"
-        data += f"\tMethod ids off: {self.method_ids_off:#x}\n"
-        data += f"\tClass defs size: {self.class_defs_size}\n"
-        data += f"\tClass defs off: {self.class_defs_off:#x}\n"
-        data += f"\tData size: {self.data_size}\n"
-        data += f"\tData off: {self.data_off:#x}\n"
-        return data
+        return ("Header:\n"
+                f"\tMagic: {MAGIC.hex()}\n"
+                f"\tVersion: {self.version}\n"
+                f"\tChecksum: {self.checksum:x}\n"
+                f"\tSignature: {self.signature.hex()}\n"
+                f"\tFile size: {self.file_size}\n"
+                f"\tHeader size: {self.HEADER_SIZE}\n"
+                f"\tEndianness: {self.endianness}\n"
+                f"\tLink size: {self.link_size}\n"
+                f"\tLink off: {self.link_off:#x}\n"
+                f"\tMap off: {self.map_off:#x}\n"
+                f"\tString ids size: {self.string_ids_size}\n"
+                f"\tString ids off: {self.string_ids_off:#x}\n"
+                f"\tType ids size: {self.type_ids_size}\n"
+                f"\tType ids off: {self.type_ids_off:#x}\n"
+                f"\tProto ids size: {self.proto_ids_size}\n"
+                f"\tProto ids off: {self.proto_ids_off:#x}\n"
+                f"\tField ids size: {self.field_ids_size}\n"
+                f"\tField ids off: {self.field_ids_off:#x}\n"
+                f"\tMethod ids size: {self.method_ids_size}\n"
+                f"\tMethod ids off: {self.method_ids_off:#x}\n"
+                f"\tClass defs size: {self.class_defs_size}\n"
+                f"\tClass defs off: {self.class_defs_off:#x}\n"
+                f"\tData size: {self.data_size}\n"
+                f"\tData off: {self.data_off:#x}\n")
 
 
 class MapList:
     """List of MapItem"""
     __slots__ = ("size", "list")
 
-    def __init__(self, data: bytes):
-        self.size = int.from_bytes(data[0 : 4], "little")
-        self.list = [MapItem(data[off : off + 12])
-                     for off in range(4, 4 + (self.size * 12), 12)]
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.size,) = _UINT.unpack_from(data, offset)
+        start = offset + _UINT.size
+        end = start + (self.size * _MAP_ITEM.size)
+        self.list = [MapItem.from_raw(*values)
+                     for values in _MAP_ITEM.iter_unpack(data[start : end])]
 
     def dump_data(self) -> str:
         """Return a string representing the map list"""
-        data = f"Map list: ({self.size} items)\n"
+        parts = [f"Map list: ({self.size} items)\n"]
         for mi in self.list:
-            data +="\t"
-            data += "\t".join(mi.dump_data().splitlines(True))
-        return data
+            parts.extend("\t" + line for line in mi.dump_lines())
+        return "".join(parts)
 
 
 class MapItem:
     """Data present in a map item"""
     __slots__ = ("type", "unused", "size", "offset")
 
-    def __init__(self, data: bytes):
-        self.type = TypeCode(int.from_bytes(data[0 : 2], "little"))
-        self.unused = int.from_bytes(data[2 : 4], "little")
-        self.size = int.from_bytes(data[4 : 8], "little")
-        self.offset = int.from_bytes(data[8 : 12], "little")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (type_, self.unused, self.size,
+         self.offset) = _MAP_ITEM.unpack_from(data, offset)
+        self.type = _type_code(type_)
+
+    @classmethod
+    def from_raw(cls, type_: int, unused: int, size: int, offset: int) -> "MapItem":
+        """Build a map item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.type = _type_code(type_)
+        item.unused = unused
+        item.size = size
+        item.offset = offset
+        return item
+
+    def dump_lines(self) -> list[str]:
+        """Return the lines representing the map item"""
+        return ["Map Item:\n",
+                f"\tType: {self.type.name}\n",
+                f"\tSize: {self.size}\n",
+                f"\tOffset: {self.offset:#x}\n"]
 
     def dump_data(self) -> str:
-        """Return a string representing the map list"""
-        data = "Map Item:\n"
-        data += f"\tType: {self.type.name}\n"
-        data += f"\tSize: {self.size}\n"
-        data += f"\tOffset: {self.offset:#x}\n"
-        return data
+        """Return a string representing the map item"""
+        return "".join(self.dump_lines())
+
+
+def _decode_mutf8(raw: bytes) -> str:
+    """Decode a MUTF-8 encoded string"""
+    # isascii() is a single C-level scan, and most dex strings are ASCII,
+    # which the ascii codec decodes without any validation state machine
+    if raw.isascii():
+        return raw.decode("ascii")
+    # MUTF-8 encodes U+0000 on 2 bytes, and characters outside the BMP as
+    # 2 encoded utf16 surrogates that must be paired back together. Java
+    # strings may also hold unpaired surrogates, which are kept as is
+    text = raw.replace(b"\xc0\x80", b"\x00").decode("utf8", "surrogatepass")
+    return text.encode("utf16", "surrogatepass").decode("utf16", "surrogatepass")
 
 
 class StringDataItem:
     """Data present in string data item"""
     __slots__ = ("utf16size", "data")
 
-    def __init__(self, data: bytes):
-        self.utf16size = int.from_bytes(data[0 : 1], "little")
-        self.data = data[1 : 1 + self.utf16size].decode("utf8")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        self.utf16size, start = decode_uleb128(data, offset)
+        # A utf16 code unit takes at most 3 bytes in MUTF-8, so only copy
+        # that much before looking for the terminating null byte
+        raw = bytes(data[start : start + (3 * self.utf16size) + 1])
+        end = raw.find(0)
+        self.data = _decode_mutf8(raw if end == -1 else raw[:end])
 
     def dump_data(self) -> str:
         """Return a string representing the string data item"""
-        data = f"({self.utf16size})\t"
-        data += self.data
-        return data
+        return f"({self.utf16size})\t{self.data}"
 
 
 class StringIdItem:
     """Data present in string id item"""
     __slots__ = ("string_data_off",)
 
-    def __init__(self, data: bytes):
-        self.string_data_off = int.from_bytes(data, "little")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.string_data_off,) = _STRING_ID_ITEM.unpack_from(data, offset)
 
-    def get_string_data_item(self, data: bytes) -> StringDataItem:
+    @classmethod
+    def from_raw(cls, string_data_off: int) -> "StringIdItem":
+        """Build a string id item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.string_data_off = string_data_off
+        return item
+
+    def get_string_data_item(self, data: bytes | memoryview) -> StringDataItem:
         """Return the string data item corresponding to the string id item"""
-        return StringDataItem(data[self.string_data_off:])
+        return StringDataItem(data, self.string_data_off)
 
-    def dump_data(self, full_data: bytes) -> str:
+    def dump_data(self, full_data: bytes | memoryview) -> str:
         """Return a string representing the string id item"""
-        data = f"{self.string_data_off:#x}\t"
-        data += self.get_string_data_item(full_data).dump_data()
-        return data
+        return f"{self.string_data_off:#x}\t{self.get_string_data_item(full_data).dump_data()}"
+
+
+class StringPool:
+    """Decode the strings referenced by string ids on demand
+
+    Each string data item is decoded at most once.
+    """
+    __slots__ = ("string_ids", "data", "_offsets", "_items", "_strings")
+
+    def __init__(self, string_ids: Sequence[StringIdItem], data: bytes | memoryview):
+        self.string_ids = string_ids
+        # Offsets are read straight from the id table column, instead of
+        # building a StringIdItem for every lookup
+        self._offsets = (string_ids.column("string_data_off") if isinstance(string_ids, IdTable)
+                         else [string_id.string_data_off for string_id in string_ids])
+        # Decoding from a memoryview avoids copying the string bytes twice
+        self.data = memoryview(data)
+        self._items: dict[int, StringDataItem] = {}
+        self._strings: dict[int, str] = {}
+
+    def get_string_data_item(self, idx: int) -> StringDataItem:
+        """Return the string data item of the string idx"""
+        item = self._items.get(idx)
+        if item is None:
+            item = self._items[idx] = StringDataItem(self.data, self._offsets[idx])
+        return item
+
+    def get(self, idx: int) -> str:
+        """Return the string idx"""
+        string = self._strings.get(idx)
+        if string is None:
+            string = self._strings[idx] = self.get_string_data_item(idx).data
+        return string
+
+    def preload(self) -> None:
+        """Decode all the strings in one pass over the string ids"""
+        if len(self._items) == len(self.string_ids):
+            return
+        data = self.data
+        items = self._items
+        for idx, off in enumerate(self._offsets):
+            if idx not in items:
+                items[idx] = StringDataItem(data, off)
+        self._strings = {idx: item.data for idx, item in items.items()}
 
 
 class TypeIdItem:
     """Data present in type id item"""
     __slots__ = ("descriptor_idx",)
 
-    def __init__(self, data):
-        self.descriptor_idx = int.from_bytes(data, "little")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.descriptor_idx,) = _TYPE_ID_ITEM.unpack_from(data, offset)
 
-    def get_string_id_item(self, string_ids: list[StringIdItem]) -> StringIdItem:
+    @classmethod
+    def from_raw(cls, descriptor_idx: int) -> "TypeIdItem":
+        """Build a type id item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.descriptor_idx = descriptor_idx
+        return item
+
+    def get_string_id_item(self, string_ids: Sequence[StringIdItem]) -> StringIdItem:
         """Return the string id item corresponding to the type id item"""
         return string_ids[self.descriptor_idx]
 
-    def dump_data(self, string_ids: list[StringIdItem],
-                  full_data: bytes) -> str:
+    def dump_data(self, strings: StringPool) -> str:
         """Return a string representing the string id item"""
-        data = f"({self.descriptor_idx})\t"
-        string_data = self.get_string_id_item(string_ids).get_string_data_item(full_data)
-        data += f"{string_data.data}"
-        return data
+        return f"({self.descriptor_idx})\t{strings.get(self.descriptor_idx)}"
+
+
+class TypeNamePool:
+    """Resolve type ids to their descriptor string on demand
+
+    Each type name is resolved at most once.
+    """
+    __slots__ = ("type_ids", "strings", "_descriptor_idxs", "_names")
+
+    def __init__(self, type_ids: Sequence[TypeIdItem], strings: StringPool):
+        self.type_ids = type_ids
+        self.strings = strings
+        # Same as StringPool, skip building a TypeIdItem for every lookup
+        self._descriptor_idxs = (type_ids.column("descriptor_idx") if isinstance(type_ids, IdTable)
+                                 else [type_id.descriptor_idx for type_id in type_ids])
+        self._names: dict[int, str] = {}
+
+    def get(self, idx: int) -> str:
+        """Return the descriptor of the type idx"""
+        name = self._names.get(idx)
+        if name is None:
+            name = self._names[idx] = self.strings.get(self._descriptor_idxs[idx])
+        return name
 
 
 class TypeItem:
     """Data present in type item"""
     __slots__ = ("type_idx",)
 
-    def __init__(self, data: bytes):
-        self.type_idx = int.from_bytes(data, "little")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.type_idx,) = _TYPE_ITEM.unpack_from(data, offset)
+
+    @classmethod
+    def from_raw(cls, type_idx: int) -> "TypeItem":
+        """Build a type item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.type_idx = type_idx
+        return item
 
-    def get_type_type_id_item(self, type_ids: list[TypeIdItem]) -> TypeIdItem:
+    def get_type_type_id_item(self, type_ids: Sequence[TypeIdItem]) -> TypeIdItem:
         """Return the type id item corresponding to the type index"""
         return type_ids[self.type_idx]
 
-    def dump_data(self, type_ids: list[TypeIdItem],
-            string_ids: list[StringIdItem], full_data: bytes) -> str:
+    def dump_data(self, type_names: TypeNamePool) -> str:
         """Return a string representing the type item"""
-        type_ = (self.get_type_type_id_item(type_ids).
-                get_string_id_item(string_ids).get_string_data_item(full_data))
-        data = f"{type_.data}"
-        return data
+        return type_names.get(self.type_idx)
 
 
 class TypeList:
     """Data present in type list"""
     __slots__ = ("size", "list")
 
-    def __init__(self, data: bytes):
-        self.size = int.from_bytes(data[0 : 4], "little")
-        self.list = [TypeItem(data[off : off + 2])
-                     for off in range(4, 4 + (self.size * 2), 2)]
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.size,) = _UINT.unpack_from(data, offset)
+        start = offset + _UINT.size
+        end = start + (self.size * _TYPE_ITEM.size)
+        self.list = [TypeItem.from_raw(type_idx)
+                     for (type_idx,) in _TYPE_ITEM.iter_unpack(data[start : end])]
 
-    def dump_data(self, type_ids: list[TypeIdItem],
-            string_ids: list[StringIdItem], full_data: bytes):
+    def dump_data(self, type_names: TypeNamePool):
         """Return a string representing the type list"""
-        data = f"({self.size} params) "
-        data += "(" + ", ".join([t.dump_data(type_ids, string_ids, full_data)
-                           for t in self.list]) + ")"
-        return data
+        types = ", ".join([t.dump_data(type_names) for t in self.list])
+        return f"({self.size} params) ({types})"
 
 
 class ProtoIdItem:
     """Data present in proto id item"""
     __slots__ = ("shorty_idx", "return_type_idx", "parameters_off")
 
-    def __init__(self, data: bytes):
-        self.shorty_idx = int.from_bytes(data[0 : 4], "little")
-        self.return_type_idx = int.from_bytes(data[4 : 8], "little")
-        self.parameters_off = int.from_bytes(data[8 : 12], "little")
-
-    def get_shorty_string_id_item(self, string_ids: list[StringIdItem]) -> StringIdItem:
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.shorty_idx, self.return_type_idx,
+         self.parameters_off) = _PROTO_ID_ITEM.unpack_from(data, offset)
+
+    @classmethod
+    def from_raw(cls, shorty_idx: int, return_type_idx: int,
+                 parameters_off: int) -> "ProtoIdItem":
+        """Build a proto id item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.shorty_idx = shorty_idx
+        item.return_type_idx = return_type_idx
+        item.parameters_off = parameters_off
+        return item
+
+    def get_shorty_string_id_item(self, string_ids: Sequence[StringIdItem]) -> StringIdItem:
         """Return the string id item corresponding to the shorty"""
         return string_ids[self.shorty_idx]
 
-    def get_return_type_type_id_item(self, type_ids: list[TypeIdItem]) -> TypeIdItem:
+    def get_return_type_type_id_item(self, type_ids: Sequence[TypeIdItem]) -> TypeIdItem:
         """Return the type id item corresponding to the return type"""
         return type_ids[self.return_type_idx]
 
-    def get_parameters(self, data: bytes) -> TypeList:
+    def get_parameters(self, data: bytes | memoryview) -> TypeList:
         """Get the function parameter types"""
         if self.parameters_off == 0x00:
             return TypeList(bytes(4))
         else:
-            return TypeList(data[self.parameters_off:])
+            return TypeList(data, self.parameters_off)
 
-    def dump_data(self, type_ids: list[TypeIdItem],
-            string_ids: list[StringIdItem], full_data: bytes):
+    def dump_data(self, type_names: TypeNamePool, strings: StringPool,
+            full_data: bytes | memoryview):
         """Return a string representing the prototype id item"""
-        shorty = self.get_shorty_string_id_item(string_ids).get_string_data_item(full_data)
-        data = f"({self.shorty_idx}) {shorty.data}\t"
-        return_type = (self.get_return_type_type_id_item(type_ids).
-                get_string_id_item(string_ids).get_string_data_item(full_data))
-        data += f"({self.return_type_idx}) {return_type.data}\t"
+        shorty = strings.get(self.shorty_idx)
+        return_type = type_names.get(self.return_type_idx)
         parameters = self.get_parameters(full_data)
-        data += f"({self.parameters_off:#x})"
-        data += parameters.dump_data(type_ids, string_ids, full_data)
-        return data
+        return (f"({self.shorty_idx}) {shorty}\t"
+                f"({self.return_type_idx}) {return_type}\t"
+                f"({self.parameters_off:#x})"
+                f"{parameters.dump_data(type_names)}")
 
 
 class FieldIdItem:
     """Data present in field id item"""
     __slots__ = ("class_idx", "type_idx", "name_idx")
 
-    def __init__(self, data: bytes):
-        self.class_idx = int.from_bytes(data[0 : 2], "little")
-        self.type_idx = int.from_bytes(data[2 : 4], "little")
-        self.name_idx = int.from_bytes(data[4 : 8], "little")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.class_idx, self.type_idx,
+         self.name_idx) = _FIELD_ID_ITEM.unpack_from(data, offset)
 
-    def get_class_type_id_item(self, type_ids: list[TypeIdItem]) -> TypeIdItem:
+    @classmethod
+    def from_raw(cls, class_idx: int, type_idx: int, name_idx: int) -> "FieldIdItem":
+        """Build a field id item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.class_idx = class_idx
+        item.type_idx = type_idx
+        item.name_idx = name_idx
+        return item
+
+    def get_class_type_id_item(self, type_ids: Sequence[TypeIdItem]) -> TypeIdItem:
         """Return the type id item corresponding to the class idx"""
         return type_ids[self.class_idx]
 
-    def get_type_type_id_item(self, type_ids: list[TypeIdItem]) -> TypeIdItem:
+    def get_type_type_id_item(self, type_ids: Sequence[TypeIdItem]) -> TypeIdItem:
         """Return the type id item corresponding to the type idx"""
         return type_ids[self.type_idx]
 
-    def get_name_string_id_item(self, string_ids: list[StringIdItem]) -> StringIdItem:
+    def get_name_string_id_item(self, string_ids: Sequence[StringIdItem]) -> StringIdItem:
         """Return the string id item corresponding to the name idx"""
         return string_ids[self.name_idx]
 
-    def dump_data(self, type_ids: list[TypeIdItem],
-            string_ids: list[StringIdItem], full_data: bytes):
+    def dump_data(self, type_names: TypeNamePool, strings: StringPool):
         """Return a string representing the field id item"""
-        class_ = (self.get_class_type_id_item(type_ids).
-                get_string_id_item(string_ids).get_string_data_item(full_data))
-        data = f"({self.class_idx}) {class_.data}\t"
-        type_ = (self.get_type_type_id_item(type_ids).
-                get_string_id_item(string_ids).get_string_data_item(full_data))
-        data += f"({self.type_idx}) {type_.data}\t"
-        name = self.get_name_string_id_item(string_ids).get_string_data_item(full_data)
-        data += f"({self.name_idx}) {name.data}"
-        return data
+        class_ = type_names.get(self.class_idx)
+        type_ = type_names.get(self.type_idx)
+        name = strings.get(self.name_idx)
+        return (f"({self.class_idx}) {class_}\t"
+                f"({self.type_idx}) {type_}\t"
+                f"({self.name_idx}) {name}")
 
 
 class MethodIdItem:
     """Data present in method id item"""
     __slots__ = ("class_idx", "proto_idx", "name_idx")
 
-    def __init__(self, data: bytes):
-        self.class_idx = int.from_bytes(data[0 : 2], "little")
-        self.proto_idx = int.from_bytes(data[2 : 4], "little")
-        self.name_idx = int.from_bytes(data[4 : 8], "little")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.class_idx, self.proto_idx,
+         self.name_idx) = _METHOD_ID_ITEM.unpack_from(data, offset)
+
+    @classmethod
+    def from_raw(cls, class_idx: int, proto_idx: int, name_idx: int) -> "MethodIdItem":
+        """Build a method id item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.class_idx = class_idx
+        item.proto_idx = proto_idx
+        item.name_idx = name_idx
+        return item
 
-    def get_class_type_id_item(self, type_ids: list[TypeIdItem]) -> TypeIdItem:
+    def get_class_type_id_item(self, type_ids: Sequence[TypeIdItem]) -> TypeIdItem:
         """Return the type id item corresponding to the class idx"""
         return type_ids[self.class_idx]
 
-    def get_proto_proto_id_item(self, proto_ids: list[ProtoIdItem]) -> ProtoIdItem:
+    def get_proto_proto_id_item(self, proto_ids: Sequence[ProtoIdItem]) -> ProtoIdItem:
         """Return the proto id item corresponding to the proto idx"""
         return proto_ids[self.proto_idx]
 
-    def get_name_string_id_item(self, string_ids: list[StringIdItem]) -> StringIdItem:
+    def get_name_string_id_item(self, string_ids: Sequence[StringIdItem]) -> StringIdItem:
         """Return the string id item corresponding to the name idx"""
         return string_ids[self.name_idx]
 
-    def dump_data(self, proto_ids: list[ProtoIdItem], type_ids: list[TypeIdItem],
-            string_ids: list[StringIdItem], full_data: bytes):
+    def dump_data(self, proto_ids: Sequence[ProtoIdItem], type_names: TypeNamePool,
+            strings: StringPool, full_data: bytes | memoryview):
         """Return a string representing the method id item"""
-        class_ = (self.get_class_type_id_item(type_ids).
-                get_string_id_item(string_ids).get_string_data_item(full_data))
-        data = f"({self.class_idx}) {class_.data}\t"
+        class_ = type_names.get(self.class_idx)
         proto = self.get_proto_proto_id_item(proto_ids)
-        proto_return_type = (proto.get_return_type_type_id_item(type_ids).
-                get_string_id_item(string_ids).get_string_data_item(full_data))
-        data += f"({self.proto_idx}) {proto_return_type.data}\t"
-        name = self.get_name_string_id_item(string_ids).get_string_data_item(full_data)
-        data += f"({self.name_idx}) {name.data}\t"
+        proto_return_type = type_names.get(proto.return_type_idx)
+        name = strings.get(self.name_idx)
         proto_param_type_list = proto.get_parameters(full_data)
-        data += "(" + ", ".join([t.dump_data(type_ids, string_ids, full_data)
-                           for t in proto_param_type_list.list]) + ")"
-        return data
+        parameters = ", ".join([t.dump_data(type_names)
+                                for t in proto_param_type_list.list])
+        return (f"({self.class_idx}) {class_}\t"
+                f"({self.proto_idx}) {proto_return_type}\t"
+                f"({self.name_idx}) {name}\t"
+                f"({parameters})")
+
+
+def decode_uleb128(data: bytes | memoryview, offset: int) -> tuple[int, int]:
+    """Decode the uleb128 number starting at offset
+
+    Return the decoded value and the offset following it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        b = data[offset]
+        offset += 1
+        value |= (b & 0x7f) << shift
+        if b < 0x80:
+            return value, offset
+        shift += 7
+        if shift == 35:
+            raise BadDexFileError("Uleb128 must be 5 bytes max")
+
+
+def _parse_byte_value(value_arg: int, data: bytes | memoryview) -> int:
+    """Parse a signed one-byte value"""
+    if value_arg != 0:
+        raise BadDexFileError("Value arg for BYTE should be 0")
+    return int.from_bytes(data[1:2], "little", signed=True)
+
+
+def _parse_signed_value(value_arg: int, data: bytes | memoryview) -> int:
+    """Parse a sign-extended value of value_arg + 1 bytes"""
+    return int.from_bytes(data[1 : value_arg + 2], "little", signed=True)
+
+
+def _parse_unsigned_value(value_arg: int, data: bytes | memoryview) -> int:
+    """Parse a zero-extended value (or index) of value_arg + 1 bytes"""
+    return int.from_bytes(data[1 : value_arg + 2], "little")
+
+
+def _parse_float_value(value_arg: int, data: bytes | memoryview) -> float:
+    """Parse a float whose missing low-order bytes are zeros"""
+    return struct.unpack("<f", bytes(data[1 : value_arg + 2]).rjust(4, b"\x00"))[0]
+
+
+def _parse_double_value(value_arg: int, data: bytes | memoryview) -> float:
+    """Parse a double whose missing low-order bytes are zeros"""
+    return struct.unpack("<d", bytes(data[1 : value_arg + 2]).rjust(8, b"\x00"))[0]
+
 
+def _parse_null_value(value_arg: int, data: bytes | memoryview) -> None:
+    """Parse a null reference"""
+    return None
 
-class Uleb128:
-    """Represents uleb128 number type"""
-    __slots__ = ("data", "_size")
 
-    def __init__(self, data: bytes):
-        size = 0
-        for idx, b in enumerate(data):
-            if (b & 0x80) == 0:
-                size = idx + 1
-                break
-            if idx == 4:
-                raise BadDexFileError("Uleb128 must be 5 bytes max")
-        self._size = size
-        self.data = data[0 : size]
+def _parse_boolean_value(value_arg: int, data: bytes | memoryview) -> bool:
+    """Parse a boolean, stored in value_arg"""
+    return bool(value_arg)
 
-    def __int__(self) -> int:
-        """Convert uleb128 to int"""
-        value = 0
-        for b in reversed(self.data):
-            value = (value << 7) | (b & 0x7f)
-        return value
+
+_VALUE_PARSERS = {
+    ValueFormat.VALUE_BYTE: _parse_byte_value,
+    ValueFormat.VALUE_SHORT: _parse_signed_value,
+    ValueFormat.VALUE_CHAR: _parse_unsigned_value,
+    ValueFormat.VALUE_INT: _parse_signed_value,
+    ValueFormat.VALUE_LONG: _parse_signed_value,
+    ValueFormat.VALUE_FLOAT: _parse_float_value,
+    ValueFormat.VALUE_DOUBLE: _parse_double_value,
+    ValueFormat.VALUE_METHOD_TYPE: _parse_unsigned_value,
+    ValueFormat.VALUE_METHOD_HANDLE: _parse_unsigned_value,
+    ValueFormat.VALUE_STRING: _parse_unsigned_value,
+    ValueFormat.VALUE_TYPE: _parse_unsigned_value,
+    ValueFormat.VALUE_FIELD: _parse_unsigned_value,
+    ValueFormat.VALUE_METHOD: _parse_unsigned_value,
+    ValueFormat.VALUE_ENUM: _parse_unsigned_value,
+    ValueFormat.VALUE_NULL: _parse_null_value,
+    ValueFormat.VALUE_BOOLEAN: _parse_boolean_value,
+}
+
+
+# Formats whose value is held in value_arg, with no bytes following
+_ARG_ONLY_VALUE_FORMATS = frozenset((ValueFormat.VALUE_NULL, ValueFormat.VALUE_BOOLEAN))
+
+
+def _parse_encoded_array(data: bytes | memoryview, offset: int) -> tuple[list["EncodedValue"], int]:
+    """Parse the encoded array at offset, return (values, next_offset)"""
+    size, off = decode_uleb128(data, offset)
+    values = []
+    for _ in range(size):
+        value = EncodedValue(data, off)
+        values.append(value)
+        off = value.end_off
+    return values, off
 
 
 class EncodedValue:
-    """Data present in annotation element"""
-    __slots__ = ("value_arg", "value_type", "value")
-
-    def __init__(self, data: bytes):
-        self.value_type = ValueFormat(data[0] & 0x1f)
-        self.value_arg = (data[0] & 0xe0 >> 5)
-        if self.value_type is ValueFormat.VALUE_BYTE:
-            if self.value_arg != 0:
-                raise BadDexFileError("Value arg for BYTE should be 0")
-            self.value = int.from_bytes(data[1:2], "little", signed=True)
-        elif self.value_type is ValueFormat.VALUE_SHORT:
-        # size - 1 (0…1)  ubyte[size] signed two-byte
-            size = self.value_arg + 1
-
-        elif self.value_type is ValueFormat.VALUE_CHAR:
-            pass
-        # size - 1 (0…1)  ubyte[size] unsigned two-byte
-        elif self.value_type is ValueFormat.VALUE_INT:
-            pass
-        # size - 1 (0…3)  ubyte[size] signed four-byte
-        elif self.value_type is ValueFormat.VALUE_LONG:
-            pass
-        # size - 1 (0…7)  ubyte[size] signed eight-byte
-        elif self.value_type is ValueFormat.VALUE_FLOAT:
-            pass
-        # size - 1 (0…3)  ubyte[size] IEEE754 32-bit
-        elif self.value_type is ValueFormat.VALUE_DOUBLE:
-            pass
-        # size - 1 (0…7)  ubyte[size] IEEE754 64-bit
-        elif self.value_type is ValueFormat.VALUE_METHOD_TYPE:
-            pass
-        # size - 1 (0…3)  ubyte[size] four-byte index proto_ids
-        elif self.value_type is ValueFormat.VALUE_METHOD_HANDLE:
-            pass
-        # size - 1 (0…3)  ubyte[size] four-byte index method_handles
-        elif self.value_type is ValueFormat.VALUE_STRING:
-            pass
-        # size - 1 (0…3)  ubyte[size] four-byte index string_ids
-        elif self.value_type is ValueFormat.VALUE_TYPE:
-            pass
-        # size - 1 (0…3)  ubyte[size] four-byte index type_ids
-        elif self.value_type is ValueFormat.VALUE_FIELD:
-            pass
-        # size - 1 (0…3)  ubyte[size] four-byte index field_ids
-        elif self.value_type is ValueFormat.VALUE_METHOD:
-            pass
-        # size - 1 (0…3)  ubyte[size] four-byte index method_ids
-        elif self.value_type is ValueFormat.VALUE_ENUM:
-            pass
-        # size - 1 (0…3)  ubyte[size] four-byte index field_ids
-        elif self.value_type is ValueFormat.VALUE_ARRAY:
-            pass
-        # (none)          encoded_array
-        elif self.value_type is ValueFormat.VALUE_ANNOTATION:
-            pass
-        # (none)          encoded_annotation
-        elif self.value_type is ValueFormat.VALUE_NULL:
-            pass
-        # (none)          (none)  null reference value
-        elif self.value_type is ValueFormat.VALUE_BOOLEAN:
-            pass
-        # boolean (0…1)   (none)
+    """Data present in annotation element
+
+    end_off is the offset right after the encoded value.
+    """
+    __slots__ = ("value_arg", "value_type", "value", "end_off")
 
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        self.value_type = _value_format(data[offset] & 0x1f)
+        self.value_arg = (data[offset] & 0xe0) >> 5
+        if self.value_type is ValueFormat.VALUE_ARRAY:
+            self.value, self.end_off = _parse_encoded_array(data, offset + 1)
+        elif self.value_type is ValueFormat.VALUE_ANNOTATION:
+            self.value = EncodedAnnotation(data, offset + 1)
+            self.end_off = self.value.end_off
+        else:
+            # At most 8 value bytes follow the header byte
+            self.value = _VALUE_PARSERS[self.value_type](self.value_arg,
+                                                         data[offset : offset + 9])
+            self.end_off = offset + 1
+            if self.value_type not in _ARG_ONLY_VALUE_FORMATS:
+                self.end_off += self.value_arg + 1
 
 
 class AnnotationElement:
-    """Data present in annotation element"""
-    __slots__ = ("name_idx", "value")
+    """Data present in annotation element
 
-    def __init__(self, data: bytes):
-        self.name_idx = Uleb128(data[0:])
-        off = len(self.name_idx.get_bytes())
-        self.value = EncodedValue(data[off:])
+    end_off is the offset right after the annotation element.
+    """
+    __slots__ = ("name_idx", "value", "end_off")
+
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        self.name_idx, off = decode_uleb128(data, offset)
+        self.value = EncodedValue(data, off)
+        self.end_off = self.value.end_off
 
 
 class EncodedAnnotation:
-    """Data present in encoded annotation format"""
-    __slots__ = ("type_idx", "size", "elements")
-
-    def __init__(self, data: bytes):
-        self.type_idx = Uleb128(data[0:])
-        off = len(self.type_idx.get_bytes())
-        self.size = Uleb128(data[off:])
-        off += len(self.size.get_bytes())
+    """Data present in encoded annotation format
+
+    end_off is the offset right after the encoded annotation.
+    """
+    __slots__ = ("type_idx", "size", "elements", "end_off")
+
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        self.type_idx, off = decode_uleb128(data, offset)
+        self.size, off = decode_uleb128(data, off)
         self.elements = []
         for _ in range(self.size):
-            self.elements.append(AnnotationElement(data[off:]))
-            off += len(self.elements[-1].get_bytes())
+            element = AnnotationElement(data, off)
+            self.elements.append(element)
+            off = element.end_off
+        self.end_off = off
 
 class AnnotationItem:
     """Data present in annotation item"""
     __slots__ = ("visibility", "annotation")
 
-    def __init__(self, data: bytes):
-        self.visibility = Visibility(int.from_bytes(data[0 : 1], "little"))
-        self.annotation = EncodedAnnotation(data[1:])
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        self.visibility = Visibility(data[offset])
+        self.annotation = EncodedAnnotation(data, offset + 1)
 
 
 class AnnotationOffItem:
     """Data present in annotation off item"""
-    __slots__ = ("annotation_off",)
+    __slots__ = ("annotations_off",)
+
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.annotations_off,) = _ANNOTATION_OFF_ITEM.unpack_from(data, offset)
 
-    def __init__(self, data: bytes):
-        self.annotations_off = int.from_bytes(data[0 : 4], "little")
+    @classmethod
+    def from_raw(cls, annotations_off: int) -> "AnnotationOffItem":
+        """Build an annotation off item from already decoded fields"""
+        item = cls.__new__(cls)
+        item.annotations_off = annotations_off
+        return item
 
-    def get_annotations(self, full_data: bytes) -> AnnotationItem:
-        return AnnotationItem[self.annotations_off:]
+    def get_annotations(self, full_data: bytes | memoryview) -> AnnotationItem:
+        return AnnotationItem(full_data, self.annotations_off)
 
 
 class AnnotationSetItem:
     """Data present in annotation set item"""
     __slots__ = ("size", "entries")
 
-    def __init__(self, data: bytes):
-        self.size = int.from_bytes(data[0 : 4], "little")
-        self.entries = [AnnotationOffItem(data[off : off + 4])
-                        for off in range(4, 4 + (self.size * 4), 4)]
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.size,) = _UINT.unpack_from(data, offset)
+        start = offset + _UINT.size
+        end = start + (self.size * _ANNOTATION_OFF_ITEM.size)
+        self.entries = [AnnotationOffItem.from_raw(annotations_off)
+                        for (annotations_off,) in _ANNOTATION_OFF_ITEM.iter_unpack(data[start : end])]
 
 
 class FieldAnnotation:
     """Data present in field annotation"""
     __slots__ = ("field_idx", "annotations_off")
 
-    def __init__(self, data: bytes):
-        self.field_idx = int.from_bytes(data[0 : 4], "little")
-        self.annotations_off = int.from_bytes(data[4 : 8], "little")
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.field_idx,
+         self.annotations_off) = _FIELD_ANNOTATION.unpack_from(data, offset)
 
-    def get_field(self, field_ids: list[FieldIdItem]) -> FieldIdItem:
+    @classmethod
+    def from_raw(cls, field_idx: int, annotations_off: int) -> "FieldAnnotation":
+        """Build a field annotation from already decoded fields"""
+        item = cls.__new__(cls)
+        item.field_idx = field_idx
+        item.annotations_off = annotations_off
+        return item
+
+    def get_field(self, field_ids: Sequence[FieldIdItem]) -> FieldIdItem:
         return field_ids[self.field_idx]
 
-    def get_annotations(self, data: bytes):
-        return AnnotationSetItem(data[self.annotations_off:])
+    def get_annotations(self, data: bytes | memoryview):
+        return AnnotationSetItem(data, self.annotations_off)
 
-    def dump_data(self, field_ids: list[FieldIdItem], full_data: bytes) -> str:
+    def dump_data(self, field_ids: Sequence[FieldIdItem], strings: StringPool,
+            full_data: bytes | memoryview) -> str:
         """Return a string representing the field annotation"""
-        field = (self.get_field(field_ids).get_string_id_item(string_ids).
-                get_string_data_item(full_data).data)
+        field = strings.get(self.get_field(field_ids).name_idx)
         data = field + ": "
         data += self.get_annotations(full_data).dump_data()
         return data
 
 
+class MethodAnnotation:
+    """Data present in method annotation"""
+    __slots__ = ("method_idx", "annotations_off")
+
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.method_idx,
+         self.annotations_off) = _METHOD_ANNOTATION.unpack_from(data, offset)
+
+    @classmethod
+    def from_raw(cls, method_idx: int, annotations_off: int) -> "MethodAnnotation":
+        """Build a method annotation from already decoded fields"""
+        item = cls.__new__(cls)
+        item.method_idx = method_idx
+        item.annotations_off = annotations_off
+        return item
+
+    def get_method(self, method_ids: Sequence[MethodIdItem]) -> MethodIdItem:
+        return method_ids[self.method_idx]
+
+    def get_annotations(self, data: bytes | memoryview):
+        return AnnotationSetItem(data, self.annotations_off)
+
+
+class ParameterAnnotation:
+    """Data present in parameter annotation"""
+    __slots__ = ("method_idx", "annotations_off")
+
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.method_idx,
+         self.annotations_off) = _PARAMETER_ANNOTATION.unpack_from(data, offset)
+
+    @classmethod
+    def from_raw(cls, method_idx: int, annotations_off: int) -> "ParameterAnnotation":
+        """Build a parameter annotation from already decoded fields"""
+        item = cls.__new__(cls)
+        item.method_idx = method_idx
+        item.annotations_off = annotations_off
+        return item
+
+    def get_method(self, method_ids: Sequence[MethodIdItem]) -> MethodIdItem:
+        return method_ids[self.method_idx]
+
+
 class AnnotationDirectoryItem:
     """Data present in annotation directory item"""
     __slots__ = ("class_annotations_off", "fields_size",
@@ -599,23 +885,22 @@ class AnnotationDirectoryItem:
                  "field_annotations", "method_annotations",
                  "parameter_annotations")
 
-    def __init__(self, data: bytes):
-        self.class_annotations_off = int.from_bytes(data[0 : 4], "little")
-        self.fields_size = int.from_bytes(data[4 : 8], "little")
-        self.annoted_methods_size = int.from_bytes(data[8 : 12], "little")
-        self.annoted_parameters_size = int.from_bytes(data[12 : 16], "little")
-        start = 16
-        end = start + (self.fields_size * 8)
-        self.field_annotations = [FieldAnnotation(data[off: off + 8])
-                                  for off in range(start, end, 8)]
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        (self.class_annotations_off, self.fields_size,
+         self.annoted_methods_size,
+         self.annoted_parameters_size) = _ANNOTATIONS_DIRECTORY_ITEM.unpack_from(data, offset)
+        start = offset + _ANNOTATIONS_DIRECTORY_ITEM.size
+        end = start + (self.fields_size * _FIELD_ANNOTATION.size)
+        self.field_annotations = [FieldAnnotation.from_raw(*values)
+                                  for values in _FIELD_ANNOTATION.iter_unpack(data[start : end])]
         start = end
-        end = start + (self.annoted_methods_size * 8)
-        self.method_annotations = [MethodAnnotation(data[off: off + 8])
-                                   for off in range(start, end, 8)]
+        end = start + (self.annoted_methods_size * _METHOD_ANNOTATION.size)
+        self.method_annotations = [MethodAnnotation.from_raw(*values)
+                                   for values in _METHOD_ANNOTATION.iter_unpack(data[start : end])]
         start = end
-        end = start + (self.annoted_parameters_size * 8)
-        self.parameter_annotations = [ParameterAnnotation(data[off: off + 8])
-                                      for off in range(start, end, 8)]
+        end = start + (self.annoted_parameters_size * _PARAMETER_ANNOTATION.size)
+        self.parameter_annotations = [ParameterAnnotation.from_raw(*values)
+                                      for values in _PARAMETER_ANNOTATION.iter_unpack(data[start : end])]
 
     def dump_data(self) -> str:
         """Return a string representing the annotation directory item"""
@@ -623,58 +908,88 @@ class AnnotationDirectoryItem:
         return data
 
 
+# The line formats of encoded fields and methods, shared by their
+# dump_data and by ClassDataItem which dumps them from its columns
+
+def _encoded_field_str(field_idx_diff: int, name: str, access_flags: int) -> str:
+    """Return a string representing an encoded field"""
+    return f"({field_idx_diff}) {name}\t{_flag_str(access_flags)}"
+
+
+def _encoded_method_str(method_idx_diff: int, name: str, access_flags: int,
+                        code_off: int) -> str:
+    """Return a string representing an encoded method"""
+    return f"({method_idx_diff}) {name}\t{_flag_str(access_flags)}\t{code_off:#x}"
+
+
 class EncodedField:
     """Data present in encoded field format"""
     __slots__ = ("field_idx_diff", "access_flags", "_size")
 
-    def __init__(self, data: bytes):
-        self.field_idx_diff = Uleb128(data[0:])
-        off = self.field_idx_diff._size
-        self.access_flags = Uleb128(data[off:])
-        self._size = off + self.access_flags._size
-
-    def get_field(self, prev_idx: int, field_ids: list[FieldIdItem]) -> FieldIdItem:
-        field_idx = prev_idx + int(self.field_idx_diff)
+    def __init__(self, data: bytes | memoryview):
+        self.field_idx_diff, off = decode_uleb128(data, 0)
+        self.access_flags, self._size = decode_uleb128(data, off)
+
+    @classmethod
+    def from_raw(cls, field_idx_diff: int, access_flags: int, size: int) -> "EncodedField":
+        """Build an encoded field from already decoded fields"""
+        item = cls.__new__(cls)
+        item.field_idx_diff = field_idx_diff
+        item.access_flags = access_flags
+        item._size = size
+        return item
+
+    def get_field(self, prev_idx: int, field_ids: Sequence[FieldIdItem]) -> FieldIdItem:
+        field_idx = prev_idx + self.field_idx_diff
         return field_ids[field_idx]
 
     def get_access_flags(self) -> AccessFlag:
-        return AccessFlag(int(self.access_flags))
-
-    def dump_data(self, prev_idx: int, field_ids: list[FieldIdItem],
-            string_ids: list[StringIdItem], full_data: bytes) -> str:
-        field = (self.get_field(prev_idx, field_ids).get_name_string_id_item(string_ids).
-            get_string_data_item(full_data).data)
-        data = f"({int(self.field_idx_diff)}) {field}\t"
-        data += f"{self.get_access_flags()}"
-        return data
+        return AccessFlag(self.access_flags)
+
+    def dump_data(self, prev_idx: int, field_ids: Sequence[FieldIdItem],
+            strings: StringPool) -> str:
+        field = strings.get(self.get_field(prev_idx, field_ids).name_idx)
+        return _encoded_field_str(self.field_idx_diff, field, self.access_flags)
 
 
 class EncodedMethod:
     """Data present in encoded method format"""
     __slots__ = ("method_idx_diff", "access_flags", "code_off", "_size")
 
-    def __init__(self, data: bytes):
-        self.method_idx_diff = Uleb128(data[0:])
-        off = self.method_idx_diff._size
-        self.access_flags = Uleb128(data[off:])
-        off = off + self.access_flags._size
-        self.code_off = Uleb128(data[off:])
-        self._size = off + self.code_off._size
-
-    def get_method(self, prev_idx: int, method_ids: list[MethodIdItem]) -> MethodIdItem:
-        method_idx = prev_idx + int(self.method_idx_diff)
+    def __init__(self, data: bytes | memoryview):
+        self.method_idx_diff, off = decode_uleb128(data, 0)
+        self.access_flags, off = decode_uleb128(data, off)
+        self.code_off, self._size = decode_uleb128(data, off)
+
+    @classmethod
+    def from_raw(cls, method_idx_diff: int, access_flags: int, code_off: int,
+                 size: int) -> "EncodedMethod":
+        """Build an encoded method from already decoded fields"""
+        item = cls.__new__(cls)
+        item.method_idx_diff = method_idx_diff
+        item.access_flags = access_flags
+        item.code_off = code_off
+        item._size = size
+        return item
+
+    def get_method(self, prev_idx: int, method_ids: Sequence[MethodIdItem]) -> MethodIdItem:
+        method_idx = prev_idx + self.method_idx_diff
         return method_ids[method_idx]
 
     def get_access_flags(self) -> AccessFlag:
-        return AccessFlag(int(self.access_flags))
-
-    def dump_data(self, prev_idx: int, method_ids: list[MethodIdItem],
-            string_ids: list[StringIdItem], full_data: bytes) -> str:
-        method = (self.get_method(prev_idx, method_ids).get_name_string_id_item(string_ids).
-            get_string_data_item(full_data).data)
-        data = f"({int(self.method_idx_diff)}) {method}\t"
-        data += f"{self.get_access_flags()}\t{int(self.code_off):#x}"
-        return data
+        return AccessFlag(self.access_flags)
+
+    def dump_data(self, prev_idx: int, method_ids: Sequence[MethodIdItem],
+            strings: StringPool) -> str:
+        method = strings.get(self.get_method(prev_idx, method_ids).name_idx)
+        return _encoded_method_str(self.method_idx_diff, method, self.access_flags,
+                                   self.code_off)
+
+
+# Shared by every class data item without fields or methods of a kind,
+# empty tuples so that no class data item can modify them for the others
+_NO_ENCODED_FIELDS = ((), (), ())
+_NO_ENCODED_METHODS = ((), (), (), ())
 
 
 class ClassDataItem:
@@ -684,64 +999,160 @@ class ClassDataItem:
                  "static_fields", "instance_fields", "direct_mehtods",
                  "virtual_methods")
 
-    def __init__(self, data: bytes):
-        self.static_fields_size = Uleb128(data[0:])
-        off = self.static_fields_size._size
-        self.instance_fields_size = Uleb128(data[off:])
-        off += self.instance_fields_size._size
-        self.direct_mehtods_size = Uleb128(data[off:])
-        off += self.direct_mehtods_size._size
-        self.virtual_methods_size = Uleb128(data[off:])
-        off += self.virtual_methods_size._size
-        self.static_fields = []
-        for _ in range(int(self.static_fields_size)):
-            self.static_fields.append(EncodedField(data[off:]))
-            off += self.static_fields[-1]._size
-        self.instance_fields = []
-        for _ in range(int(self.instance_fields_size)):
-            self.instance_fields.append(EncodedField(data[off:]))
-            off += self.instance_fields[-1]._size
-        self.direct_mehtods = []
-        for _ in range(int(self.direct_mehtods_size)):
-            self.direct_mehtods.append(EncodedMethod(data[off:]))
-            off += self.direct_mehtods[-1]._size
-        self.virtual_methods = []
-        for _ in range(int(self.virtual_methods_size)):
-            self.virtual_methods.append(EncodedMethod(data[off:]))
-            off += self.virtual_methods[-1]._size
-
-    def dump_data(self, method_ids: list[MethodIdItem], field_ids: list[FieldIdItem],
-            proto_ids: list[ProtoIdItem], type_ids: list[TypeIdItem],
-            string_ids: list[StringIdItem], full_data: bytes) -> str:
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        self.reset(data, offset)
+
+    def reset(self, data: bytes | memoryview, offset: int = 0) -> None:
+        """Decode the class data item at offset into this instance"""
+        self.static_fields_size, off = decode_uleb128(data, offset)
+        self.instance_fields_size, off = decode_uleb128(data, off)
+        self.direct_mehtods_size, off = decode_uleb128(data, off)
+        self.virtual_methods_size, off = decode_uleb128(data, off)
+        try:
+            self.static_fields, off = self._decode_fields(data, off, self.static_fields_size)
+            self.instance_fields, off = self._decode_fields(data, off, self.instance_fields_size)
+            self.direct_mehtods, off = self._decode_methods(data, off, self.direct_mehtods_size)
+            self.virtual_methods, off = self._decode_methods(data, off, self.virtual_methods_size)
+        except OverflowError:
+            raise BadDexFileError("Uleb128 value does not fit in 32 bits") from None
+
+    # The two loops below are the innermost loops of a full parse, so the
+    # uleb128 decoding is inlined for the common single byte case and the
+    # column appends are hoisted into locals. Entries are stored as one
+    # array per field, EncodedField and EncodedMethod views are only built
+    # on access
+
+    @staticmethod
+    def _decode_fields(data: bytes | memoryview, off: int,
+                       count: int) -> tuple[tuple[Sequence[int], ...], int]:
+        """Decode count encoded fields as (field_idx_diff, access_flags, size)
+        columns, return them and the next offset"""
+        if not count:
+            return _NO_ENCODED_FIELDS, off
+        diffs = array("I")
+        flags = array("I")
+        sizes = array("B")
+        append_diff = diffs.append
+        append_flags = flags.append
+        append_size = sizes.append
+        for _ in range(count):
+            start = off
+            field_idx_diff = data[off]
+            if field_idx_diff < 0x80:
+                off += 1
+            else:
+                field_idx_diff, off = decode_uleb128(data, off)
+            access_flags = data[off]
+            if access_flags < 0x80:
+                off += 1
+            else:
+                access_flags, off = decode_uleb128(data, off)
+            append_diff(field_idx_diff)
+            append_flags(access_flags)
+            append_size(off - start)
+        return (diffs, flags, sizes), off
+
+    @staticmethod
+    def _decode_methods(data: bytes | memoryview, off: int,
+                        count: int) -> tuple[tuple[Sequence[int], ...], int]:
+        """Decode count encoded methods as (method_idx_diff, access_flags,
+        code_off, size) columns, return them and the next offset"""
+        if not count:
+            return _NO_ENCODED_METHODS, off
+        diffs = array("I")
+        flags = array("I")
+        code_offs = array("I")
+        sizes = array("B")
+        append_diff = diffs.append
+        append_flags = flags.append
+        append_code_off = code_offs.append
+        append_size = sizes.append
+        for _ in range(count):
+            start = off
+            method_idx_diff = data[off]
+            if method_idx_diff < 0x80:
+                off += 1
+            else:
+                method_idx_diff, off = decode_uleb128(data, off)
+            access_flags = data[off]
+            if access_flags < 0x80:
+                off += 1
+            else:
+                access_flags, off = decode_uleb128(data, off)
+            code_off, off = decode_uleb128(data, off)
+            append_diff(method_idx_diff)
+            append_flags(access_flags)
+            append_code_off(code_off)
+            append_size(off - start)
+        return (diffs, flags, code_offs, sizes), off
+
+    # The two dumps below format the same lines as EncodedField.dump_data
+    # and EncodedMethod.dump_data straight from the columns, the field and
+    # method indexes being the running sums of the idx diffs
+
+    @staticmethod
+    def _dump_fields(parts: list[str], columns: tuple[Sequence[int], ...],
+                     field_ids: Sequence[FieldIdItem], strings: StringPool,
+                     indent: str) -> None:
+        """Append the lines representing the encoded fields to parts"""
+        diffs, flags, _ = columns
+        for prev_idx, field_idx_diff, access_flags in zip(
+                accumulate(diffs, initial=0), diffs, flags):
+            field = strings.get(field_ids[prev_idx + field_idx_diff].name_idx)
+            parts.append(f"{indent}\t{_encoded_field_str(field_idx_diff, field, access_flags)}\n")
+
+    @staticmethod
+    def _dump_methods(parts: list[str], columns: tuple[Sequence[int], ...],
+                      method_ids: Sequence[MethodIdItem], strings: StringPool,
+                      indent: str) -> None:
+        """Append the lines representing the encoded methods to parts"""
+        diffs, flags, code_offs, _ = columns
+        for prev_idx, method_idx_diff, access_flags, code_off in zip(
+                accumulate(diffs, initial=0), diffs, flags, code_offs):
+            method = strings.get(method_ids[prev_idx + method_idx_diff].name_idx)
+            line = _encoded_method_str(method_idx_diff, method, access_flags, code_off)
+            parts.append(f"{indent}\t{line}\n")
+
+    def get_static_fields(self) -> Iterator[EncodedField]:
+        return map(EncodedField.from_raw, *self.static_fields)
+
+    def get_instance_fields(self) -> Iterator[EncodedField]:
+        return map(EncodedField.from_raw, *self.instance_fields)
+
+    def get_direct_methods(self) -> Iterator[EncodedMethod]:
+        return map(EncodedMethod.from_raw, *self.direct_mehtods)
+
+    def get_virtual_methods(self) -> Iterator[EncodedMethod]:
+        return map(EncodedMethod.from_raw, *self.virtual_methods)
+
+    def dump_lines(self, method_ids: Sequence[MethodIdItem], field_ids: Sequence[FieldIdItem],
+            proto_ids: Sequence[ProtoIdItem], type_names: TypeNamePool,
+            strings: StringPool, indent: str = "") -> list[str]:
+        """Return the lines representing the class data item, each one
+        prefixed with indent"""
+        parts = [f"{indent}Static fields: ({self.static_fields_size})\n"]
+        self._dump_fields(parts, self.static_fields, field_ids, strings, indent)
+        parts.append(f"{indent}Instance fields: ({self.instance_fields_size})\n")
+        self._dump_fields(parts, self.instance_fields, field_ids, strings, indent)
+        parts.append(f"{indent}Direct methods: ({self.direct_mehtods_size})\n")
+        self._dump_methods(parts, self.direct_mehtods, method_ids, strings, indent)
+        parts.append(f"{indent}Virtual methods: ({self.virtual_methods_size})\n")
+        self._dump_methods(parts, self.virtual_methods, method_ids, strings, indent)
+        return parts
+
+    def dump_data(self, method_ids: Sequence[MethodIdItem], field_ids: Sequence[FieldIdItem],
+            proto_ids: Sequence[ProtoIdItem], type_names: TypeNamePool,
+            strings: StringPool) -> str:
         """Return a string representing the class data item"""
-        data = f"Static fields: ({int(self.static_fields_size)})\n"
-        prev_idx = 0
-        for f in self.static_fields:
-            data += f"\t{f.dump_data(prev_idx, field_ids, string_ids, full_data)}\n"
-            prev_idx += int(f.field_idx_diff)
-        prev_idx = 0
-        data += f"Instance fields: ({int(self.instance_fields_size)})\n"
-        for f in self.instance_fields:
-            data += f"\t{f.dump_data(prev_idx, field_ids, string_ids, full_data)}\n"
-            prev_idx += int(f.field_idx_diff)
-        prev_idx = 0
-        data += f"Direct methods: ({int(self.direct_mehtods_size)})\n"
-        for m in self.direct_mehtods:
-            data += f"\t{m.dump_data(prev_idx, method_ids, string_ids, full_data)}\n"
-            prev_idx += int(m.method_idx_diff)
-        prev_idx = 0
-        data += f"Virtual methods: ({int(self.virtual_methods_size)})\n"
-        for m in self.virtual_methods:
-            data += f"\t{m.dump_data(prev_idx, method_ids, string_ids, full_data)}\n"
-            prev_idx += int(m.method_idx_diff)
-        return data
+        return "".join(self.dump_lines(method_ids, field_ids, proto_ids,
+                                       type_names, strings))
 
 
 class EncodedArrayItem:
     """Data present in class data item"""
     __slots__ = ("a",)
 
-    def __init__(self, data: bytes):
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
         pass
 
     def dump_data(self) -> str:
@@ -750,226 +1161,436 @@ class EncodedArrayItem:
         return data
 
 
+# Printed in place of the references a class def does not have
+_NONE = "None"
+
+
 class ClassDefItem:
     """Data present in class def item"""
     __slots__ = ("class_idx", "access_flags", "superclass_idx",
                  "interfaces_off", "source_file_idx", "annotations_off",
                  "class_data_off", "static_values_off")
 
-    def __init__(self, data: bytes):
-        self.class_idx = int.from_bytes(data[0 : 4], "little")
-        self.access_flags = AccessFlag(int.from_bytes(data[4 : 8], "little"))
-        self.superclass_idx = int.from_bytes(data[8 : 12], "little")
-        self.interfaces_off = int.from_bytes(data[12 : 16], "little")
-        self.source_file_idx = int.from_bytes(data[16 : 20], "little")
-        self.annotations_off = int.from_bytes(data[20 : 24], "little")
-        self.class_data_off = int.from_bytes(data[24 : 28], "little")
-        self.static_values_off = int.from_bytes(data[28 : 32], "little")
-
-    def get_class_type_id_item(self, type_ids: list[TypeIdItem]) -> TypeIdItem:
+    def __init__(self, data: bytes | memoryview, offset: int = 0):
+        self.reset(data, offset)
+
+    def reset(self, data: bytes | memoryview, offset: int = 0) -> None:
+        """Decode the class def item at offset into this instance"""
+        self._set(*_CLASS_DEF_ITEM.unpack_from(data, offset))
+
+    def _set(self, class_idx: int, access_flags: int, superclass_idx: int,
+             interfaces_off: int, source_file_idx: int, annotations_off: int,
+             class_data_off: int, static_values_off: int) -> None:
+        """Store already decoded fields into this instance"""
+        self.class_idx = class_idx
+        self.access_flags = access_flags
+        self.superclass_idx = superclass_idx
+        self.interfaces_off = interfaces_off
+        self.source_file_idx = source_file_idx
+        self.annotations_off = annotations_off
+        self.class_data_off = class_data_off
+        self.static_values_off = static_values_off
+
+    @classmethod
+    def from_raw(cls, class_idx: int, access_flags: int, superclass_idx: int,
+                 interfaces_off: int, source_file_idx: int, annotations_off: int,
+                 class_data_off: int, static_values_off: int) -> "ClassDefItem":
+        """Build a class def item from already decoded fields"""
+        item = cls.__new__(cls)
+        item._set(class_idx, access_flags, superclass_idx, interfaces_off,
+                  source_file_idx, annotations_off, class_data_off,
+                  static_values_off)
+        return item
+
+    def get_class_type_id_item(self, type_ids: Sequence[TypeIdItem]) -> TypeIdItem:
         """Return the type id item corresponding to the class idx"""
         return type_ids[self.class_idx]
 
-    def get_superclass_type_id_item(self, type_ids: list[TypeIdItem]) -> TypeIdItem | None:
+    def get_access_flags(self) -> AccessFlag:
+        return AccessFlag(self.access_flags)
+
+    def get_superclass_type_id_item(self, type_ids: Sequence[TypeIdItem]) -> TypeIdItem | None:
         """Return the type id item corresponding to the superclass idx"""
         if self.superclass_idx == NO_INDEX:
             return None
         else:
             return type_ids[self.superclass_idx]
 
-    def get_interfaces_type_list(self, data: bytes) -> TypeList | None:
+    def get_interfaces_type_list(self, data: bytes | memoryview) -> TypeList | None:
         """Return the type list corresponding to the interface off"""
         if self.interfaces_off == 0x00:
             return None
         else:
-            return TypeList(data[self.interfaces_off:])
+            return TypeList(data, self.interfaces_off)
 
-    def get_source_file_string_id_item(self, string_ids: list[StringIdItem]) -> StringIdItem | None:
+    def get_source_file_string_id_item(self, string_ids: Sequence[StringIdItem]) -> StringIdItem | None:
         """Return the string id item corresponding to the source file idx"""
         if self.source_file_idx == NO_INDEX:
             return None
         else:
             return string_ids[self.source_file_idx]
 
-    def get_annotations_annotation_directory_item(self, data: bytes) -> AnnotationDirectoryItem | None:
+    def get_annotations_annotation_directory_item(self, data: bytes | memoryview) -> AnnotationDirectoryItem | None:
         """Return the annotation directory item corresponding to the annotation off"""
         if self.annotations_off == 0x00:
             return None
         else:
-            return AnnotationDirectoryItem(data[self.annotations_off:])
+            return AnnotationDirectoryItem(data, self.annotations_off)
+
+    def get_class_data_class_data_item(self, data: bytes | memoryview,
+            reuse: ClassDataItem | None = None) -> ClassDataItem | None:
+        """Return the class data item corresponding to the class data off
 
-    def get_class_data_class_data_item(self, data: bytes) -> ClassDataItem | None:
-        """Return the class data item corresponding to the class data off"""
+        If reuse is given, it is reset with the class data and returned
+        instead of a new item.
+        """
         if self.class_data_off == 0x00:
             return None
+        elif reuse is not None:
+            reuse.reset(data, self.class_data_off)
+            return reuse
         else:
-            return ClassDataItem(data[self.class_data_off:])
+            return ClassDataItem(data, self.class_data_off)
 
-    def get_static_values_encoded_array_item(self, data: bytes) -> EncodedArrayItem | None:
+    def get_static_values_encoded_array_item(self, data: bytes | memoryview) -> EncodedArrayItem | None:
         """Return the enocoded array item corresponding to the static values off"""
         if self.static_values_off == 0x00:
             return None
         else:
-            return EncodedArrayItem(data[self.static_values_off:])
-
-    def dump_data(self, method_ids: list[MethodIdItem], field_ids: list[FieldIdItem],
-            proto_ids: list[ProtoIdItem], type_ids: list[TypeIdItem],
-            string_ids: list[StringIdItem], full_data: bytes):
-        """Return a string representing the class def item"""
-        class_ = self.get_class_type_id_item(type_ids).get_string_id_item(string_ids).get_string_data_item(full_data)
-        data = f"Class: ({self.class_idx}) {class_.data}\n"
-        data += f"Access flags: {self.access_flags}\n"
-        superclass = self.get_superclass_type_id_item(type_ids)
-        data += f"Superclass: ({self.superclass_idx}) "
-        if superclass is None:
-            data += "None\n"
-        else:
-            data += superclass.get_string_id_item(string_ids).get_string_data_item(full_data).data + "\n"
+            return EncodedArrayItem(data, self.static_values_off)
+
+    def dump_lines(self, method_ids: Sequence[MethodIdItem], field_ids: Sequence[FieldIdItem],
+            proto_ids: Sequence[ProtoIdItem], type_names: TypeNamePool,
+            strings: StringPool, full_data: bytes | memoryview,
+            class_data_item: ClassDataItem | None = None,
+            indent: str = "") -> list[str]:
+        """Return the lines representing the class def item, each one
+        prefixed with indent
+
+        class_data_item is reused to decode the class data if given.
+        """
+        class_ = type_names.get(self.class_idx)
+        superclass = (_NONE if self.superclass_idx == NO_INDEX
+                      else type_names.get(self.superclass_idx))
         interfaces = self.get_interfaces_type_list(full_data)
-        data += f"\nInterfaces: ({self.interfaces_off:#x}) "
-        if interfaces is None:
-            data += "None\n"
-        else:
-            data += interfaces.dump_data(type_ids, string_ids, full_data) + "\n"
-        source_file = self.get_source_file_string_id_item(string_ids)
-        data += f"Source file: ({self.source_file_idx}) "
-        if source_file is None:
-            data += "None\n"
-        else:
-            data += source_file.get_string_data_item(full_data).data + "\n"
+        interfaces = _NONE if interfaces is None else interfaces.dump_data(type_names)
+        source_file = (_NONE if self.source_file_idx == NO_INDEX
+                       else strings.get(self.source_file_idx))
         annotations = self.get_annotations_annotation_directory_item(full_data)
-        data += f"Annotations: ({self.annotations_off:#x}) "
-        if annotations is None:
-            data += "None\n"
-        else:
-            data += annotations.dump_data() + "\n"
-        class_data = self.get_class_data_class_data_item(full_data)
-        data += f"Class data: ({self.class_data_off:#x}) "
+        annotations = _NONE if annotations is None else annotations.dump_data()
+        parts = [f"{indent}Class: ({self.class_idx}) {class_}\n",
+                 f"{indent}Access flags: {_flag_str(self.access_flags)}\n",
+                 f"{indent}Superclass: ({self.superclass_idx}) {superclass}\n",
+                 f"{indent}\n",
+                 f"{indent}Interfaces: ({self.interfaces_off:#x}) {interfaces}\n",
+                 f"{indent}Source file: ({self.source_file_idx}) {source_file}\n",
+                 f"{indent}Annotations: ({self.annotations_off:#x}) {annotations}\n"]
+        class_data = self.get_class_data_class_data_item(full_data, class_data_item)
         if class_data is None:
-            data += "None\n"
+            parts.append(f"{indent}Class data: ({self.class_data_off:#x}) {_NONE}\n")
         else:
-            dump = class_data.dump_data(method_ids, field_ids, proto_ids,
-                type_ids, string_ids, full_data)
-            data += "\n\t" + "\t".join(dump.splitlines(True)) + "\n"
+            parts.append(f"{indent}Class data: ({self.class_data_off:#x}) \n")
+            parts.extend(class_data.dump_lines(method_ids, field_ids, proto_ids,
+                                               type_names, strings, indent + "\t"))
+            parts.append(f"{indent}\n")
         static_values = self.get_static_values_encoded_array_item(full_data)
-        data += f"Static values: ({self.interfaces_off:#x}) "
-        if static_values is None:
-            data += "None\n"
+        static_values = _NONE if static_values is None else static_values.dump_data()
+        parts.append(f"{indent}Static values: ({self.static_values_off:#x}) {static_values}\n")
+        parts.append(f"{indent}\n")
+        return parts
+
+    def dump_data(self, method_ids: Sequence[MethodIdItem], field_ids: Sequence[FieldIdItem],
+            proto_ids: Sequence[ProtoIdItem], type_names: TypeNamePool,
+            strings: StringPool, full_data: bytes | memoryview) -> str:
+        """Return a string representing the class def item"""
+        return "".join(self.dump_lines(method_ids, field_ids, proto_ids,
+                                       type_names, strings, full_data))
+
+
+def _type_codes(layout: struct.Struct) -> str:
+    """Return the type code of each field of layout, repeat counts expanded"""
+    # struct and array share the "B", "H" and "I" type codes
+    return "".join(code * int(count or 1)
+                   for count, code in re.findall(r"(\d*)(\D)", layout.format.lstrip("<")))
+
+
+def _table_fields(layout: struct.Struct) -> list[tuple[str, int, int]] | None:
+    """Return the type code, offset and width of each field of layout
+
+    Return None when the fields cannot be read as strided native arrays:
+    on big endian hosts, or when a field is not aligned on its width.
+    """
+    if sys.byteorder != "little":
+        return None
+    fields = []
+    field_off = 0
+    for code in _type_codes(layout):
+        width = struct.calcsize("<" + code)
+        if (array(code).itemsize != width or field_off % width
+                or layout.size % width):
+            return None
+        fields.append((code, field_off, width))
+        field_off += width
+    return fields
+
+
+class IdTable(Sequence):
+    """Fixed size items of a table, stored as one array per field
+
+    Items are only built when they are accessed.
+    """
+    __slots__ = ("item_type", "columns")
+
+    def __init__(self, item_type: type, layout: struct.Struct,
+                 data: bytes | memoryview, offset: int, size: int):
+        self.item_type = item_type
+        table = memoryview(data)[offset : offset + (size * layout.size)]
+        if len(table) != size * layout.size:
+            raise BadDexFileError(f"Table at {offset:#x} goes past the end of the file")
+        fields = _table_fields(layout)
+        if fields is None:
+            type_codes = _type_codes(layout)
+            rows = layout.iter_unpack(table)
+            columns = zip(*rows) if size else [()] * len(type_codes)
+            self.columns = tuple(array(code, column)
+                                 for code, column in zip(type_codes, columns))
         else:
-            data += static_values.dump_data() + "\n"
-        data += "\n"
-        return data
+            # A column is a strided view of the table, cast to the field
+            # width, so it is copied out in C without unpacking the rows
+            self.columns = tuple(
+                array(code, table.cast(code)[field_off // width :: layout.size // width].tobytes())
+                for code, field_off, width in fields)
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def column(self, name: str) -> array:
+        """Return the column of the item field name"""
+        return self.columns[self.item_type.__slots__.index(name)]
+
+    def __getitem__(self, idx: int | slice):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        return self.item_type.from_raw(*[column[idx] for column in self.columns])
+
+    def __iter__(self) -> Iterator:
+        return map(self.item_type.from_raw, *self.columns)
 
 
 class DexParser:
     """Parse dex binary data"""
-    __slots__ = ("full_data", "header", "map_list", "string_ids", "type_ids",
-                 "proto_ids", "field_ids", "method_ids", "class_defs")
+    __slots__ = ("full_data", "header", "map_list", "string_ids", "strings",
+                 "type_ids", "type_names", "proto_ids", "field_ids", "method_ids",
+                 "class_defs")
 
     EXPECTED_HEADER_SIZE = 112
     ENDIAN_CONSTANT = b"\x12\x34\x56\x78"
     REVERSE_ENDIAN_CONSTANT = b"\x78\x56\x34\x12"
+    PRINT_BATCH_SIZE = 4096
 
 
-    def __init__(self, data: bytes):
+    def __init__(self, data: bytes | memoryview, verify: bool = True):
+        # Items are built from the whole file and the offset they start at,
+        # the few remaining slices of a memoryview share the file buffer.
+        # Buffers of any item format are seen as bytes
+        data = memoryview(data).cast("B").toreadonly()
         self.full_data = data
-        self.header = HeaderItem(data)
-        self.map_list = MapList(data[self.header.map_off:])
+        self.header = HeaderItem(data, verify)
+        self.map_list = MapList(data, self.header.map_off)
 
         start = self.header.string_ids_off
         size = self.header.string_ids_size
-        self.string_ids = [StringIdItem(data[off : off + 4])
-            for off in range(start,  start + (size * 4), 4)]
+        self.string_ids = IdTable(StringIdItem, _STRING_ID_ITEM, data, start, size)
+        self.strings = StringPool(self.string_ids, data)
 
         start = self.header.type_ids_off
         size = self.header.type_ids_size
-        self.type_ids = [TypeIdItem(data[off : off + 4])
-            for off in range(start,  start + (size * 4), 4)]
+        self.type_ids = IdTable(TypeIdItem, _TYPE_ID_ITEM, data, start, size)
+        self.type_names = TypeNamePool(self.type_ids, self.strings)
 
         start = self.header.proto_ids_off
         size = self.header.proto_ids_size
-        self.proto_ids = [ProtoIdItem(data[off : off + 12])
-            for off in range(start,  start + (size * 12), 12)]
+        self.proto_ids = IdTable(ProtoIdItem, _PROTO_ID_ITEM, data, start, size)
 
         start = self.header.field_ids_off
         size = self.header.field_ids_size
-        self.field_ids = [FieldIdItem(data[off : off + 8])
-            for off in range(start,  start + (size * 8), 8)]
+        self.field_ids = IdTable(FieldIdItem, _FIELD_ID_ITEM, data, start, size)
 
         start = self.header.method_ids_off
         size = self.header.method_ids_size
-        self.method_ids = [MethodIdItem(data[off : off + 8])
-            for off in range(start,  start + (size * 8), 8)]
+        self.method_ids = IdTable(MethodIdItem, _METHOD_ID_ITEM, data, start, size)
 
         start = self.header.class_defs_off
         size = self.header.class_defs_size
-        self.class_defs = [ClassDefItem(data[off : off + 32])
-            for off in range(start,  start + (size * 32), 32)]
-
-    def print_all(self) -> None:
-        """Print all parsed informations"""
-        print(self.header.dump_data())
-        print(self.map_list.dump_data())
-        print(self.dump_all_strings())
-        print(self.dump_all_types())
-        print(self.dump_all_prototypes())
-        print(self.dump_all_fields())
-        print(self.dump_all_methods())
-        print(self.dump_all_class_defs())
+        self.class_defs = IdTable(ClassDefItem, _CLASS_DEF_ITEM, data, start, size)
+
+    def get_string(self, idx: int) -> str:
+        """Return the string idx"""
+        return self.strings.get(idx)
+
+    def type_name(self, idx: int) -> str:
+        """Return the descriptor of the type idx"""
+        return self.type_names.get(idx)
+
+    def class_def(self, idx: int) -> ClassDefItem:
+        """Return the class def idx"""
+        return self.class_defs[idx]
+
+    def print_all(self, jobs: int = 1) -> None:
+        """Print all parsed informations
+
+        Class defs are dumped by jobs worker processes when jobs > 1.
+        """
+        # Lines are written in batches as they are produced, so the whole
+        # dump never has to be held in memory at once, without paying for
+        # one text layer write per line
+        write = sys.stdout.write
+        lines = self.iter_all(jobs)
+        while batch := list(islice(lines, self.PRINT_BATCH_SIZE)):
+            write("".join(batch))
+
+    def iter_all(self, jobs: int = 1) -> Iterator[str]:
+        """Yield the lines representing all parsed informations"""
+        # Every string ends up in the dump, decode them all upfront
+        self.strings.preload()
+        yield self.header.dump_data()
+        yield "\n"
+        yield self.map_list.dump_data()
+        yield "\n"
+        for lines in (self.iter_strings(), self.iter_types(),
+                      self.iter_prototypes(), self.iter_fields(),
+                      self.iter_methods(), self.iter_class_defs(jobs)):
+            yield from lines
+            yield "\n"
+
+    def iter_strings(self) -> Iterator[str]:
+        yield "Strings:\n"
+        for idx, s in enumerate(self.string_ids):
+            string_data = self.strings.get_string_data_item(idx)
+            yield f"\t{s.string_data_off:#x}\t{string_data.dump_data()}\n"
+
+    def iter_types(self) -> Iterator[str]:
+        yield "Types:\n"
+        for t in self.type_ids:
+            yield f"\t{t.dump_data(self.strings)}\n"
+
+    def iter_prototypes(self) -> Iterator[str]:
+        yield "Prototypes:\n"
+        for p in self.proto_ids:
+            yield f"\t{p.dump_data(self.type_names, self.strings, self.full_data)}\n"
+
+    def iter_fields(self) -> Iterator[str]:
+        yield "Fields:\n"
+        for f in self.field_ids:
+            yield f"\t{f.dump_data(self.type_names, self.strings)}\n"
+
+    def iter_methods(self) -> Iterator[str]:
+        yield "Methods:\n"
+        for m in self.method_ids:
+            yield f"\t{m.dump_data(self.proto_ids, self.type_names, self.strings, self.full_data)}\n"
+
+    def iter_class_defs(self, jobs: int = 1) -> Iterator[str]:
+        """Yield the lines representing the class defs
+
+        When jobs > 1, the class defs are split in shards dumped by that
+        many worker processes, and yielded in order one shard at a time.
+        """
+        yield "Class defs:\n"
+        size = self.header.class_defs_size
+        if jobs > 1 and size > 1:
+            yield from self._iter_class_def_shards(jobs)
+        else:
+            yield from self._iter_class_def_lines(0, size)
+
+    def _iter_class_def_shards(self, jobs: int) -> Iterator[str]:
+        """Dump the class defs in worker processes sharing the dex data"""
+        size = self.header.class_defs_size
+        # A few shards per worker keeps them busy when classes vary in size
+        step = -(-size // (jobs * 4))
+        shards = [(start, min(start + step, size)) for start in range(0, size, step)]
+        data_size = self.full_data.nbytes
+        shm = SharedMemory(create=True, size=data_size)
+        try:
+            shm.buf[:data_size] = self.full_data
+            with ProcessPoolExecutor(jobs, initializer=_init_class_defs_worker,
+                                     initargs=(shm.name, data_size)) as executor:
+                yield from executor.map(_dump_class_def_shard, shards)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _iter_class_def_lines(self, start: int, stop: int) -> Iterator[str]:
+        """Yield the lines representing the class defs start to stop"""
+        # Each class def is dumped before moving to the next one, so a
+        # single class def and class data item are reset for every row
+        # instead of allocating new ones. The class def fields are taken
+        # from the class_defs columns, which are already decoded
+        class_def = ClassDefItem.__new__(ClassDefItem)
+        class_data = ClassDataItem.__new__(ClassDataItem)
+        rows = zip(*[column[start:stop] for column in self.class_defs.columns])
+        for row in rows:
+            class_def._set(*row)
+            yield from class_def.dump_lines(self.method_ids, self.field_ids,
+                    self.proto_ids, self.type_names, self.strings,
+                    self.full_data, class_data, "\t")
+            yield "\n"
 
     def dump_all_strings(self) -> str:
-        data = "Strings:\n"
-        for s in self.string_ids:
-            data += f"\t{s.dump_data(self.full_data)}\n"
-        return data
+        return "".join(self.iter_strings())
 
     def dump_all_types(self) -> str:
-        data = "Types:\n"
-        for t in self.type_ids:
-            data += f"\t{t.dump_data(self.string_ids, self.full_data)}\n"
-        return data
+        return "".join(self.iter_types())
 
     def dump_all_prototypes(self) -> str:
-        data = "Prototypes:\n"
-        for p in self.proto_ids:
-            data += f"\t{p.dump_data(self.type_ids, self.string_ids, self.full_data)}\n"
-        return data
+        return "".join(self.iter_prototypes())
 
     def dump_all_fields(self) -> str:
-        data = "Fields:\n"
-        for f in self.field_ids:
-            data += f"\t{f.dump_data(self.type_ids, self.string_ids, self.full_data)}\n"
-        return data
+        return "".join(self.iter_fields())
 
     def dump_all_methods(self) -> str:
-        data = "Methods:\n"
-        for m in self.method_ids:
-            data += f"\t{m.dump_data(self.proto_ids, self.type_ids, self.string_ids, self.full_data)}\n"
-        return data
+        return "".join(self.iter_methods())
 
     def dump_all_class_defs(self) -> str:
-        data = "Class defs:\n"
-        for c in self.class_defs:
-            dump = c.dump_data(self.method_ids, self.field_ids, self.proto_ids,
-                self.type_ids, self.string_ids, self.full_data)
-            dump = "\t".join(dump.splitlines(True))
-            data += f"\t{dump}\n"
-        return data
+        return "".join(self.iter_class_defs())
+
+
+# State of a class defs dump worker process, see DexParser.iter_class_defs
+_worker_shm: SharedMemory | None = None
+_worker_dex: DexParser | None = None
+
+
+def _init_class_defs_worker(shm_name: str, size: int) -> None:
+    """Parse the dex data shared by the main process"""
+    global _worker_shm, _worker_dex
+    _worker_shm = SharedMemory(shm_name)
+    # The main process already verified the header
+    _worker_dex = DexParser(_worker_shm.buf[:size], verify=False)
+
+
+def _dump_class_def_shard(bounds: tuple[int, int]) -> str:
+    """Return the lines representing the class defs in bounds"""
+    return "".join(_worker_dex._iter_class_def_lines(*bounds))
 
 
 def main(argv: list[str]) -> int:
-    if len(argv) != 2:
-        print(f"usage: {argv[0]} <file.dex>")
+    if len(argv) not in (2, 3) or (len(argv) == 3 and not argv[2].isdigit()):
+        print(f"usage: {argv[0]} <file.dex> [jobs]")
         return 64
+    jobs = int(argv[2]) if len(argv) == 3 else 1
 
     with open(argv[1], "rb") as f:
-        data = f.read()
+        # Parse straight from the page cache instead of copying the file.
+        # The mapping stays open as long as the parser refers to it
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files, pipes and other non regular files cannot be mapped
+            data = f.read()
 
     dex = DexParser(data)
-    dex.print_all()
+    dex.print_all(jobs)
     return 0
 
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main(sys.argv))